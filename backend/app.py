@@ -6,6 +6,17 @@ import platform
 import threading
 import traceback
 import gc
+import hmac
+import itertools
+import json
+import pickle
+import shutil
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 import nltk
 import gdown
@@ -15,24 +26,83 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Header
+from pydantic import BaseModel, ValidationError
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import IR modules
 from src.tfidf_index import TFIDFIndex
-from src.bm25_index import BM25Index
+from src.bm25f_index import BM25FIndex
+from src.positional_index import PositionalIndex
+from src.facets import FacetIndex
 from src.search import HybridSearch
-from src.preprocessing import basic_clean, tokenize, remove_stopwords, lemmatize
+from src.admission import SearchExecutor, Overloaded, DeadlineExceeded
+from src.query_log import QueryLog, top_queries
+from src.memory import (
+    rss_bytes, peak_rss_bytes, reset_peak_rss, memory_report, fit_to_budget, release_memory,
+)
+from src.preprocessing import (
+    basic_clean, tokenize, remove_stopwords, lemmatize, preprocess_title, build_search_text, extract_phrases,
+)
 
 # ---------------------------
 # Global state
 # ---------------------------
-df = None
-search_engine = None
 init_error = None          # stores error message if startup failed
 init_done = False          # True once background init finishes
 
+# What /search serves: (engine, active version info, previous version info),
+# published as one tuple so readers never see an engine with another
+# version's info. Version info: {"version", "dataset", "built_at",
+# "build_memory", "compactions", "snapshot"}. The previous version is kept
+# only as an on-disk snapshot so that rollback does not hold two indices
+# in memory.
+serving = (None, None, None)
+reload_state = {"status": "idle", "target": None, "error": None}
+_reload_lock = threading.Lock()
+_version_counter = itertools.count(1)
+
+# Version directories created by this process. Several workers can share
+# data/versions/, so a process only ever deletes its own.
+_own_versions = set()
+
+# Every worker holds a shared lock on this file while it runs; an exclusive
+# lock can only be taken when no other worker is alive.
+_workers_lock_file = None
+
+# What peak_rss_bytes() currently covers (the high-water mark is reset
+# at the start of every build where the platform allows it)
+peak_rss_since = "process start"
+
+# Optional memory budget for the indexed data (MB); unset = no compaction
+MEMORY_BUDGET_MB = os.environ.get("MEMORY_BUDGET_MB")
+
+# Admin endpoints (/admin/*) are disabled unless this is set. Reload and
+# rollback swap the index of the one process that receives the request, so
+# they are refused (409) while other workers (uvicorn --workers N) share
+# data/versions/; restart the workers to roll out a new dataset instead.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+# Admission control for /search: searches running at once, searches allowed
+# to wait for a worker, and how long a request may wait in total
+SEARCH_WORKERS = int(os.environ.get("SEARCH_WORKERS", "2"))
+SEARCH_QUEUE_LIMIT = int(os.environ.get("SEARCH_QUEUE_LIMIT", "32"))
+SEARCH_DEADLINE_MS = int(os.environ.get("SEARCH_DEADLINE_MS", "5000"))
+
+search_executor = SearchExecutor(max_workers=SEARCH_WORKERS, queue_limit=SEARCH_QUEUE_LIMIT)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "..", "data")
+VERSIONS_DIR = os.path.join(DATA_DIR, "versions")
+DEFAULT_DATASET = "preprocessed_60000.csv"
+
+# Sampled query log, replayed at startup to warm up a new index version
+QUERY_LOG_PATH = os.environ.get("QUERY_LOG_PATH", os.path.join(DATA_DIR, "query_log.jsonl"))
+QUERY_LOG_SAMPLE_RATE = float(os.environ.get("QUERY_LOG_SAMPLE_RATE", "0.1"))
+WARMUP_QUERIES = int(os.environ.get("WARMUP_QUERIES", "50"))
+
+query_log = QueryLog(QUERY_LOG_PATH, sample_rate=QUERY_LOG_SAMPLE_RATE)
+
 
 # ---------------------------
 # Helper: resolve NLTK data directory (platform-aware)
@@ -47,16 +117,277 @@ def _get_nltk_data_dir() -> str:
     return os.path.join(base, "..", "nltk_data")
 
 
+# ---------------------------
+# Index build (shared by startup and reload)
+# ---------------------------
+def _build_engine(data_path: str, version: str) -> tuple[HybridSearch, dict]:
+    """
+    Build a HybridSearch from a preprocessed dataset.
+    Returns the engine and its version info.
+    """
+    global peak_rss_since
+
+    # Peaks are measured from here, so a reload does not just repeat the
+    # startup high-water mark. Where the reset is unsupported they cover
+    # the whole process lifetime, and are labelled that way.
+    peak_rss_since = f"build of {version}" if reset_peak_rss() else "process start"
+    build_memory = {"peak_rss_since": peak_rss_since, "phases": {}}
+
+    def sample(phase):
+        build_memory["phases"][phase] = {"rss_bytes": rss_bytes(), "peak_rss_bytes": peak_rss_bytes()}
+
+    version_dir = os.path.join(VERSIONS_DIR, version)
+    os.makedirs(version_dir, exist_ok=True)
+    _own_versions.add(version)
+
+    # ---------- LOAD DATASET (memory-efficient) ----------
+    print(f"[{version}] Loading dataset...", flush=True)
+    df = pd.read_csv(data_path)
+
+    required_cols = {"ingredients_tokens", "steps_tokens"}
+    if not required_cols.issubset(df.columns):
+        raise RuntimeError(
+            f"Dataset missing columns: {required_cols - set(df.columns)}"
+        )
+
+    # Parse token columns — these are stored as string repr of lists
+    print(f"[{version}] Parsing token columns...", flush=True)
+    df["ingredients_tokens"] = df["ingredients_tokens"].apply(eval)
+    df["steps_tokens"] = df["steps_tokens"].apply(eval)
+    sample("load")
+
+    # The stored search_text repeats title/ingredient tokens to fake
+    # field weights; BM25F weights fields at query time instead.
+    if "search_text" in df.columns:
+        df = df.drop(columns=["search_text"])
+    if "title_tokens" in df.columns:
+        df["title_tokens"] = df["title_tokens"].apply(eval)
+    else:
+        print(f"[{version}] Tokenizing titles...", flush=True)
+        df["title_tokens"] = df["name"].apply(preprocess_title)
+
+    # ---------- BUILD TF-IDF INDEX ----------
+    print(f"[{version}] Building TF-IDF index...", flush=True)
+    search_texts = [
+        build_search_text(title, ing, steps)
+        for title, ing, steps in zip(df["title_tokens"], df["ingredients_tokens"], df["steps_tokens"])
+    ]
+    tfidf_index = TFIDFIndex(search_texts)
+    del search_texts
+    gc.collect()
+    sample("tfidf")
+
+    # ---------- BUILD BM25F INDEX ----------
+    print(f"[{version}] Building BM25F index...", flush=True)
+    bm25_index = BM25FIndex({
+        "title": df["title_tokens"].tolist(),
+        "ingredients": df["ingredients_tokens"].tolist(),
+        "steps": df["steps_tokens"].tolist(),
+    })
+    gc.collect()
+    sample("bm25")
+
+    # ---------- BUILD POSITIONAL INDEX ----------
+    print(f"[{version}] Building positional index...", flush=True)
+    positional_index = PositionalIndex({
+        "ingredients": df["ingredients_tokens"].tolist(),
+        "steps": df["steps_tokens"].tolist(),
+    })
+    gc.collect()
+    sample("positional")
+
+    # Drop heavy token columns from df — they're already inside the indices
+    df = df.drop(columns=["title_tokens", "ingredients_tokens", "steps_tokens"])
+    gc.collect()
+
+    # ---------- BUILD FACET INDEX ----------
+    print(f"[{version}] Building facet index...", flush=True)
+    facet_index = FacetIndex(df)
+
+    # ---------- BUILD HYBRID SEARCH ----------
+    print(f"[{version}] Building Hybrid Search...", flush=True)
+    engine = HybridSearch(tfidf_index, bm25_index, df, positional_index, facet_index)
+    del df
+
+    # ---------- FIT MEMORY BUDGET ----------
+    compactions = []
+    if MEMORY_BUDGET_MB:
+        budget = int(float(MEMORY_BUDGET_MB) * 1024 * 1024)
+        compactions = fit_to_budget(engine, budget, os.path.join(version_dir, "display_fields.bin"))
+        gc.collect()
+        print(f"[{version}] Memory budget {MEMORY_BUDGET_MB} MB: applied {compactions or 'nothing'}", flush=True)
+        if memory_report(engine)["total_bytes"] > budget:
+            print(f"[{version}] ⚠️  Index still exceeds the memory budget after compaction.", flush=True)
+
+    sample("ready")
+
+    info = {
+        "version": version,
+        "dataset": os.path.basename(data_path),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "build_memory": build_memory,
+        "compactions": compactions,
+        "snapshot": None,
+    }
+    return engine, info
+
+
+def _new_version_id(dataset: str) -> str:
+    # The pid keeps ids unique across workers sharing data/versions/
+    stem = os.path.splitext(os.path.basename(dataset))[0]
+    return f"v{next(_version_counter)}-{stem}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+def _remove_version_dir(version: str):
+    shutil.rmtree(os.path.join(VERSIONS_DIR, version), ignore_errors=True)
+    _own_versions.discard(version)
+
+
+def _register_worker():
+    global _workers_lock_file
+    if fcntl is None:
+        return
+    os.makedirs(VERSIONS_DIR, exist_ok=True)
+    _workers_lock_file = open(os.path.join(VERSIONS_DIR, ".workers.lock"), "a")
+    fcntl.flock(_workers_lock_file, fcntl.LOCK_SH)
+
+
+def _is_only_worker() -> bool:
+    """
+    True if no other process shares data/versions/ (unknown without fcntl:
+    assume a single worker).
+    """
+    if _workers_lock_file is None:
+        return True
+    try:
+        fcntl.flock(_workers_lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+    finally:
+        fcntl.flock(_workers_lock_file, fcntl.LOCK_SH)
+
+
+# ---------------------------
+# Warm-up: replay popular queries before a version serves traffic
+# ---------------------------
+def _warm_up(engine: HybridSearch, version: str):
+    """
+    Run the most frequent logged queries (or the evaluation queries if
+    there is no log yet) so the first real users do not pay for cold
+    paths: the WordNet corpus load, untouched index pages and mmapped
+    display fields.
+    """
+    if WARMUP_QUERIES <= 0:
+        return
+
+    def key(record):
+        try:
+            return _normalized_request(SearchQuery(**record))
+        except (ValidationError, TypeError):
+            return None
+
+    records = top_queries(QUERY_LOG_PATH, WARMUP_QUERIES, key)
+    if not records:
+        with open(os.path.join(BASE_DIR, "eval_queries.json")) as f:
+            records = [{"query": q["query"]} for q in json.load(f)]
+
+    start = time.perf_counter()
+    done = 0
+    for record in records:
+        try:
+            _run_search(engine, SearchQuery(**record))
+            done += 1
+        except Exception as exc:
+            print(f"[{version}] Warm-up query failed: {exc}", flush=True)
+    print(f"[{version}] Warmed up with {done} queries in {time.perf_counter() - start:.1f}s", flush=True)
+
+
+# ---------------------------
+# Version swap / snapshots
+# ---------------------------
+def _save_snapshot(engine: HybridSearch, info: dict) -> str:
+    path = os.path.join(VERSIONS_DIR, info["version"], "engine.pkl")
+    with open(path, "wb") as f:
+        pickle.dump(engine, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _load_snapshot(info: dict) -> HybridSearch:
+    with open(info["snapshot"], "rb") as f:
+        return pickle.load(f)
+
+
+def _activate(engine: HybridSearch, info: dict):
+    """
+    Atomically point /search at `engine`. The outgoing version is
+    snapshotted to disk for rollback and then released; in-flight
+    requests keep their own reference and finish on it.
+    """
+    global serving
+
+    old_engine, old_info, _ = serving
+    if old_engine is not None and not old_info["snapshot"]:
+        print(f"[{old_info['version']}] Saving snapshot for rollback...", flush=True)
+        old_info["snapshot"] = _save_snapshot(old_engine, old_info)
+
+    # Single reference assignment — atomic under the GIL
+    serving = (engine, info, old_info)
+    print(f"[{info['version']}] Now serving.", flush=True)
+
+    # Keep only the active and previous version directories on disk
+    keep = {v["version"] for v in (info, old_info) if v}
+    for version in list(_own_versions - keep):
+        _remove_version_dir(version)
+
+    del old_engine
+    release_memory()
+
+
+def _run_reload(dataset: str):
+    version = None
+    try:
+        version = _new_version_id(dataset)
+        reload_state["target"] = version
+        engine, info = _build_engine(os.path.join(DATA_DIR, dataset), version)
+        _warm_up(engine, version)
+        _activate(engine, info)
+        del engine
+        reload_state.update(status="idle", error=None)
+    except Exception as exc:
+        traceback.print_exc()
+        reload_state.update(status="failed", error=str(exc))
+        # Drop the half-built version (it may hold a partial display store)
+        if version is not None and version not in {v["version"] for v in serving[1:] if v}:
+            _remove_version_dir(version)
+    finally:
+        _reload_lock.release()
+
+
+def _run_rollback(info: dict):
+    try:
+        reload_state["target"] = info["version"]
+        print(f"[{info['version']}] Loading snapshot...", flush=True)
+        engine = _load_snapshot(info)
+        _warm_up(engine, info["version"])
+        _activate(engine, info)
+        del engine
+        reload_state.update(status="idle", error=None)
+    except Exception as exc:
+        traceback.print_exc()
+        reload_state.update(status="failed", error=str(exc))
+    finally:
+        _reload_lock.release()
+
+
 # ---------------------------
 # Background initialisation (runs in a thread)
 # ---------------------------
 def _initialize():
-    global df, search_engine, init_error, init_done
+    global init_error, init_done
 
     print(">>> background init started", flush=True)
 
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
     try:
         # ---------- NLTK SETUP ----------
         print("Setting up NLTK...", flush=True)
@@ -78,9 +409,8 @@ def _initialize():
         print("NLTK ready.", flush=True)
 
         # ---------- DATASET SETUP ----------
-        DATA_DIR = os.path.join(BASE_DIR, "..", "data")
         os.makedirs(DATA_DIR, exist_ok=True)
-        DATA_PATH = os.path.join(DATA_DIR, "preprocessed_60000.csv")
+        DATA_PATH = os.path.join(DATA_DIR, DEFAULT_DATASET)
 
         if not os.path.exists(DATA_PATH):
             print("Dataset not found. Downloading via gdown...", flush=True)
@@ -95,52 +425,19 @@ def _initialize():
         else:
             print("Dataset already present, skipping download.", flush=True)
 
-        # ---------- LOAD DATASET (memory-efficient) ----------
-        print("Loading dataset...", flush=True)
-        df = pd.read_csv(DATA_PATH)
-
-        required_cols = {"ingredients_tokens", "steps_tokens", "search_text"}
-        if not required_cols.issubset(df.columns):
-            raise RuntimeError(
-                f"Dataset missing columns: {required_cols - set(df.columns)}"
-            )
-
-        # Parse token columns — these are stored as string repr of lists
-        print("Parsing token columns...", flush=True)
-        df["ingredients_tokens"] = df["ingredients_tokens"].apply(eval)
-        df["steps_tokens"] = df["steps_tokens"].apply(eval)
-
-        # ---------- BUILD TF-IDF INDEX ----------
-        print("Building TF-IDF index...", flush=True)
-        search_texts = df["search_text"].tolist()
-        tfidf_index = TFIDFIndex(search_texts)
-        del search_texts
-        gc.collect()
-
-        # ---------- BUILD BM25 INDEX ----------
-        print("Building BM25 index...", flush=True)
-        ingredient_tokens = df["ingredients_tokens"].tolist()
-        bm25_index = BM25Index(ingredient_tokens)
-        del ingredient_tokens
-        gc.collect()
-
-        # Free raw documents stored inside BM25 (they are duplicates)
-        bm25_index.free_raw_documents()
-        gc.collect()
-
-        # ---------- BUILD HYBRID SEARCH ----------
-        print("Building Hybrid Search...", flush=True)
-        search_engine = HybridSearch(tfidf_index, bm25_index, df)
-
-        # Drop heavy token columns from df — they're already inside the indices
-        df = df.drop(columns=["ingredients_tokens", "steps_tokens", "search_text"])
-        gc.collect()
+        # ---------- BUILD INDICES ----------
+        engine, info = _build_engine(DATA_PATH, _new_version_id(DEFAULT_DATASET))
+        _warm_up(engine, info["version"])
+        _activate(engine, info)
+        del engine
 
         print("✅ Backend ready!", flush=True)
 
     except Exception as exc:
         traceback.print_exc()
         init_error = str(exc)
+        for version in list(_own_versions):
+            _remove_version_dir(version)
         print(
             "⚠️  Startup failed — the /search endpoint will return 503 "
             "until the issue is resolved.",
@@ -155,10 +452,16 @@ def _initialize():
 # ---------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    _register_worker()
     thread = threading.Thread(target=_initialize, daemon=True)
     thread.start()
     print(">>> server is accepting connections (init running in background)", flush=True)
     yield
+    search_executor.shutdown()
+    query_log.close()
+    # Snapshots are not reusable by a new process (no live engine)
+    for version in list(_own_versions):
+        _remove_version_dir(version)
     print(">>> shutdown", flush=True)
 
 
@@ -181,14 +484,104 @@ app.add_middleware(
 # ---------------------------
 @app.get("/health")
 def health():
+    engine, active, previous = serving
     return {
         "status": "ok",
-        "search_ready": search_engine is not None,
+        "search_ready": engine is not None,
         "init_done": init_done,
         "init_error": init_error,
+        "index_version": active["version"] if active else None,
+        "previous_version": previous["version"] if previous else None,
+        "reload": reload_state,
     }
 
 
+# ---------------------------
+# Memory report
+# ---------------------------
+@app.get("/debug/memory")
+def debug_memory():
+    engine, version, _ = serving
+    if engine is None:
+        raise HTTPException(status_code=503, detail="Search engine is not ready.")
+
+    report = memory_report(engine)
+    return {
+        "index_version": version["version"],
+        "process": {
+            "rss_bytes": rss_bytes(),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "peak_rss_since": peak_rss_since,
+        },
+        "build_memory": version["build_memory"],
+        "budget": {
+            "budget_bytes": int(float(MEMORY_BUDGET_MB) * 1024 * 1024) if MEMORY_BUDGET_MB else None,
+            "compactions": version["compactions"],
+        },
+        **report,
+    }
+
+
+# ---------------------------
+# Search admission metrics
+# ---------------------------
+@app.get("/debug/search-queue")
+def debug_search_queue():
+    return search_executor.metrics()
+
+
+# ---------------------------
+# Admin: reload / rollback index versions
+# ---------------------------
+class ReloadRequest(BaseModel):
+    dataset: str | None = None     # file name inside data/, default: active dataset
+
+
+def _require_admin(token: str | None):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set).")
+    if not hmac.compare_digest(token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+    if not _is_only_worker():
+        raise HTTPException(
+            status_code=409,
+            detail="Reload/rollback only swap the receiving worker; run a single worker or restart all workers.",
+        )
+
+
+def _start_background(target, *args):
+    if not _reload_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A reload or rollback is already in progress.")
+    reload_state.update(status="building", target=None, error=None)
+    threading.Thread(target=target, args=args, daemon=True).start()
+
+
+@app.post("/admin/reload", status_code=202)
+def admin_reload(data: ReloadRequest | None = None, x_admin_token: str | None = Header(default=None)):
+    _require_admin(x_admin_token)
+    _, active, _ = serving
+    if not init_done or active is None:
+        raise HTTPException(status_code=503, detail="Initial index is not ready yet.")
+
+    dataset = (data.dataset if data and data.dataset else None) or active["dataset"]
+    if os.path.basename(dataset) != dataset or not os.path.isfile(os.path.join(DATA_DIR, dataset)):
+        raise HTTPException(status_code=400, detail=f"Dataset not found in data/: {dataset}")
+
+    _start_background(_run_reload, dataset)
+    return {"status": "building", "dataset": dataset, "active_version": active["version"]}
+
+
+@app.post("/admin/rollback", status_code=202)
+def admin_rollback(x_admin_token: str | None = Header(default=None)):
+    _require_admin(x_admin_token)
+    _, active, previous = serving
+    if previous is None or not previous["snapshot"]:
+        raise HTTPException(status_code=409, detail="No previous version to roll back to.")
+
+    _start_background(_run_rollback, previous)
+    return {"status": "building", "target": previous["version"], "active_version": active["version"]}
+
+
 # ---------------------------
 # Request Model
 # ---------------------------
@@ -198,40 +591,61 @@ class SearchQuery(BaseModel):
     cuisine: str | None = None
     max_time: int | None = None
     top_k: int = 10
+    field_weights: dict[str, float] | None = None
+    facets: bool = False
 
 
 # ---------------------------
-# Search Endpoint
+# Query preprocessing
 # ---------------------------
-@app.post("/search")
-def search_recipes(data: SearchQuery):
-    if search_engine is None:
-        if not init_done:
-            raise HTTPException(
-                status_code=503,
-                detail="Server is still starting up. Please wait a moment and try again.",
-            )
-        raise HTTPException(
-            status_code=503,
-            detail=f"Search engine failed to initialize: {init_error or 'unknown error'}",
-        )
-
-    cleaned = basic_clean(data.query)
+def _query_tokens(text: str) -> list[str]:
+    cleaned = basic_clean(text)
     tokens = tokenize(cleaned)
     tokens = remove_stopwords(tokens)
 
     try:
-        query_tokens = lemmatize(tokens)
+        return lemmatize(tokens)
     except Exception:
-        query_tokens = tokens
+        return tokens
+
+
+# ---------------------------
+# Search Endpoint
+# ---------------------------
+def _normalized_request(data: SearchQuery) -> tuple:
+    """
+    Normalized request identity: concurrent requests with the same key
+    share one search, and warm-up groups logged queries by it.
+    Only normalizations the search itself applies are allowed here: TF-IDF
+    tokenizes the raw query and the diet filter joins the raw values into
+    a regex, so both are keyed as sent. Cuisine is stripped and lowercased
+    by filter_by_cuisine.
+    """
+    return (
+        data.query,
+        tuple(data.diet or []),
+        (data.cuisine or "").strip().lower(),
+        data.max_time,
+        data.top_k,
+        tuple(sorted((data.field_weights or {}).items())),
+        data.facets,
+    )
+
+
+def _run_search(engine: HybridSearch, data: SearchQuery) -> dict:
+    query_tokens = _query_tokens(data.query)
+    phrases = [_query_tokens(p) for p in extract_phrases(data.query)]
 
-    results = search_engine.search(
+    results = engine.search(
         query=data.query,
         query_tokens=query_tokens,
         top_k=data.top_k,
         diet=data.diet,
         cuisine=data.cuisine,
         max_time=data.max_time,
+        field_weights=data.field_weights,
+        phrases=phrases,
+        facets=data.facets,
     )
 
     output = []
@@ -252,4 +666,51 @@ def search_recipes(data: SearchQuery):
             }
         )
 
-    return {"results": output}
+    response = {"results": output}
+    if data.facets:
+        response["facets"] = results.attrs.get("facets")
+    return response
+
+
+@app.post("/search")
+async def search_recipes(data: SearchQuery):
+    # Take one reference: a concurrent reload swaps the global, but this
+    # request keeps searching the version it started on.
+    engine = serving[0]
+    if engine is None:
+        if not init_done:
+            raise HTTPException(
+                status_code=503,
+                detail="Server is still starting up. Please wait a moment and try again.",
+            )
+        raise HTTPException(
+            status_code=503,
+            detail=f"Search engine failed to initialize: {init_error or 'unknown error'}",
+        )
+
+    # Invalid requests (400) are not logged, so warm-up never replays them
+    invalid = False
+    try:
+        return await search_executor.run(
+            (id(engine), _normalized_request(data)),
+            lambda: _run_search(engine, data),
+            SEARCH_DEADLINE_MS / 1000,
+        )
+    except ValueError as exc:
+        invalid = True
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Overloaded:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many searches in progress. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    except DeadlineExceeded:
+        raise HTTPException(
+            status_code=503,
+            detail="Search timed out under load. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    finally:
+        if not invalid:
+            query_log.record(data.model_dump(exclude_defaults=True))
@@ -0,0 +1,116 @@
+import sys, os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_DIR)
+
+import time
+import numpy as np
+import pandas as pd
+
+from src.tfidf_index import TFIDFIndex
+from src.bm25f_index import BM25FIndex
+from src.positional_index import PositionalIndex
+from src.search import HybridSearch
+from src.preprocessing import preprocess_title, build_search_text, basic_clean, tokenize, remove_stopwords, lemmatize, extract_phrases
+
+# ---------------------------
+# LOAD DATA
+# ---------------------------
+print("Loading dataset...")
+df = pd.read_csv(os.path.join(ROOT_DIR, "data", "preprocessed_60000.csv"))
+df["ingredients_tokens"] = df["ingredients_tokens"].apply(eval)
+df["steps_tokens"] = df["steps_tokens"].apply(eval)
+df["title_tokens"] = df["name"].apply(preprocess_title)
+
+# ---------------------------
+# BUILD INDEXES
+# ---------------------------
+print("Building TF-IDF index...")
+tfidf = TFIDFIndex([
+    build_search_text(title, ing, steps)
+    for title, ing, steps in zip(df["title_tokens"], df["ingredients_tokens"], df["steps_tokens"])
+])
+
+print("Building BM25F index...")
+bm25 = BM25FIndex({
+    "title": df["title_tokens"].tolist(),
+    "ingredients": df["ingredients_tokens"].tolist(),
+    "steps": df["steps_tokens"].tolist(),
+})
+
+print("Building positional index...")
+start = time.perf_counter()
+positional = PositionalIndex({
+    "ingredients": df["ingredients_tokens"].tolist(),
+    "steps": df["steps_tokens"].tolist(),
+})
+build_s = time.perf_counter() - start
+
+# Resident size of the token columns: every list object plus each distinct
+# string once. The lists come from eval(), which interns identifier-like
+# tokens, so the same string object is shared by many lists.
+raw_bytes = 0
+strings = {}
+for column in ("ingredients_tokens", "steps_tokens"):
+    for tokens in df[column]:
+        raw_bytes += sys.getsizeof(tokens)
+        for t in tokens:
+            strings[id(t)] = t
+raw_bytes += sum(sys.getsizeof(t) for t in strings.values())
+del strings
+searcher = HybridSearch(tfidf, bm25, df.drop(columns=["title_tokens", "ingredients_tokens", "steps_tokens"]), positional)
+
+# ---------------------------
+# SIZE
+# ---------------------------
+print(f"\nPositional index built in {build_s:.1f}s")
+print(f"Raw token columns:   {raw_bytes / 1e6:8.1f} MB")
+print(f"Compressed postings: {positional.nbytes() / 1e6:8.1f} MB "
+      f"({100 * positional.nbytes() / raw_bytes:.1f}% of raw)")
+
+# ---------------------------
+# LATENCY
+# ---------------------------
+def query_tokens(text):
+    return lemmatize(remove_stopwords(tokenize(basic_clean(text))))
+
+QUERIES = [
+    '"olive oil" pasta',
+    '"brown sugar" cookies',
+    '"sour cream" chicken',
+    '"cream cheese" frosting',
+    '"soy sauce" rice',
+]
+REPEATS = 5
+
+rows = []
+for query in QUERIES:
+    tokens = query_tokens(query)
+    phrases = [query_tokens(p) for p in extract_phrases(query)]
+
+    timings = {}
+    for label, kwargs in [
+        ("bag-of-words", {"proximity_weight": 0}),
+        ("proximity", {}),
+        ("phrase+proximity", {"phrases": phrases}),
+    ]:
+        samples = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            searcher.search(query, tokens, top_k=10, **kwargs)
+            samples.append(time.perf_counter() - start)
+        timings[label] = np.median(samples) * 1000
+
+    start = time.perf_counter()
+    matches = sum(len(positional.phrase_docs(p)) for p in phrases)
+    phrase_ms = (time.perf_counter() - start) * 1000
+
+    rows.append([query, matches, phrase_ms, timings["bag-of-words"], timings["proximity"], timings["phrase+proximity"]])
+
+# ---------------------------
+# OUTPUT RESULTS
+# ---------------------------
+df_results = pd.DataFrame(rows, columns=[
+    "Query", "Phrase matches", "Phrase eval (ms)", "Bag-of-words (ms)", "Proximity (ms)", "Phrase+proximity (ms)",
+])
+print()
+print(df_results.to_string(index=False, float_format="%.1f"))
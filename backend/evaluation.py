@@ -6,9 +6,9 @@ import json
 import numpy as np
 
 from src.tfidf_index import TFIDFIndex
-from src.bm25_index import BM25Index
+from src.bm25f_index import BM25FIndex
 from src.search import HybridSearch
-from src.preprocessing import preprocess_ingredients, preprocess_steps, build_search_text, basic_clean, tokenize, remove_stopwords, lemmatize
+from src.preprocessing import preprocess_title, build_search_text, basic_clean, tokenize, remove_stopwords, lemmatize
 
 import pandas as pd
 
@@ -17,15 +17,25 @@ import pandas as pd
 # ---------------------------
 print("Loading dataset...")
 df = pd.read_csv("../data/preprocessed_60000.csv")
+df["ingredients_tokens"] = df["ingredients_tokens"].apply(eval)
+df["steps_tokens"] = df["steps_tokens"].apply(eval)
+df["title_tokens"] = df["name"].apply(preprocess_title)
 
 # ---------------------------
 # BUILD INDEXES
 # ---------------------------
 print("Building TF-IDF index...")
-tfidf = TFIDFIndex(df["search_text"].tolist())
-
-print("Building BM25 index...")
-bm25 = BM25Index(df["search_text"].tolist())
+tfidf = TFIDFIndex([
+    build_search_text(title, ing, steps)
+    for title, ing, steps in zip(df["title_tokens"], df["ingredients_tokens"], df["steps_tokens"])
+])
+
+print("Building BM25F index...")
+bm25 = BM25FIndex({
+    "title": df["title_tokens"].tolist(),
+    "ingredients": df["ingredients_tokens"].tolist(),
+    "steps": df["steps_tokens"].tolist(),
+})
 
 print("Building Hybrid Search...")
 searcher = HybridSearch(tfidf, bm25, df)
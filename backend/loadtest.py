@@ -0,0 +1,224 @@
+"""
+Load-test /search with a replayed or synthetic query log.
+
+In-process (ASGI, no network):
+    python backend/loadtest.py --concurrency 1,4,16,64 --requests 500
+Against a running server (e.g. uvicorn with several workers):
+    python backend/loadtest.py --url http://127.0.0.1:10000 --log queries.jsonl
+
+Searches run on the backend's bounded search executor; compare sizes with
+SEARCH_WORKERS / SEARCH_QUEUE_LIMIT / SEARCH_DEADLINE_MS (env vars, read at import).
+"""
+import sys, os
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT_DIR)
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+
+# Fields of the /search request body that are replayed from a log
+SEARCH_FIELDS = {"query", "diet", "cuisine", "max_time", "top_k", "field_weights", "facets"}
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+# ---------------------------
+# QUERY LOG
+# ---------------------------
+def load_query_log(path):
+    """
+    One JSON object per line; only /search body fields are kept.
+    """
+    queries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            queries.append({k: v for k, v in record.items() if k in SEARCH_FIELDS and v is not None})
+    return queries
+
+
+def synthetic_queries(n, seed=0):
+    """
+    Ingredient/dish queries with a realistic mix of filters:
+    most requests unfiltered, some with diet, cuisine or time limits.
+    """
+    rng = random.Random(seed)
+
+    with open(os.path.join(os.path.dirname(__file__), "eval_queries.json")) as f:
+        base = [q["query"] for q in json.load(f)]
+    ingredients = [
+        "chicken", "rice", "spinach", "tomato", "potato", "paneer", "egg", "beef",
+        "mushroom", "lentil", "pasta", "cheese", "garlic", "onion", "tofu", "salmon",
+    ]
+    dishes = ["curry", "soup", "salad", "pasta", "stir fry", "cake", "bread", "stew", "tacos"]
+    phrases = ['"olive oil"', '"brown sugar"', '"sour cream"', '"cream cheese"']
+
+    queries = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.3:
+            text = rng.choice(base)
+        elif roll < 0.9:
+            text = f"{rng.choice(ingredients)} {rng.choice(dishes)}"
+        else:
+            text = f"{rng.choice(phrases)} {rng.choice(dishes)}"
+
+        body = {"query": text}
+        if rng.random() < 0.2:
+            body["diet"] = rng.sample(["vegetarian", "vegan", "gluten-free"], rng.randint(1, 2))
+        if rng.random() < 0.3:
+            body["cuisine"] = rng.choice(["indian", "italian", "mexican", "chinese", "thai"])
+        if rng.random() < 0.25:
+            body["max_time"] = rng.choice([15, 30, 60, 120])
+        queries.append(body)
+
+    return queries
+
+
+# ---------------------------
+# RUNNER
+# ---------------------------
+async def run_level(client, queries, concurrency, total, timeout):
+    """
+    Closed loop: `concurrency` workers send requests back to back until
+    `total` requests have been issued.
+    """
+    latencies = []
+    statuses = Counter()
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < total:
+            body = queries[next_index % len(queries)]
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                response = await client.post("/search", json=body, timeout=timeout)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return summarize(concurrency, latencies, statuses, elapsed)
+
+
+def summarize(concurrency, latencies, statuses, elapsed):
+    lat = np.array(latencies)
+    n = len(lat)
+    ok = sum(v for k, v in statuses.items() if isinstance(k, int) and 200 <= k < 300)
+    counts = np.histogram(lat, bins=[0] + LATENCY_BUCKETS_MS + [np.inf])[0]
+
+    return {
+        "concurrency": concurrency,
+        "requests": n,
+        "elapsed_s": elapsed,
+        "throughput_qps": n / elapsed if elapsed else 0.0,
+        "ok_qps": ok / elapsed if elapsed else 0.0,
+        "error_rate": (n - ok) / n if n else 0.0,
+        "rate_503": statuses.get(503, 0) / n if n else 0.0,
+        "rate_429": statuses.get(429, 0) / n if n else 0.0,
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "latency_ms": {
+            "p50": float(np.percentile(lat, 50)) if n else 0.0,
+            "p90": float(np.percentile(lat, 90)) if n else 0.0,
+            "p99": float(np.percentile(lat, 99)) if n else 0.0,
+            "max": float(lat.max()) if n else 0.0,
+        },
+        "histogram_ms": {
+            f"<={b}" if b != np.inf else f">{LATENCY_BUCKETS_MS[-1]}": int(c)
+            for b, c in zip(LATENCY_BUCKETS_MS + [np.inf], counts)
+        },
+    }
+
+
+async def wait_until_ready(client, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        health = (await client.get("/health")).json()
+        if health.get("init_done"):
+            if not health.get("search_ready"):
+                raise RuntimeError(f"Backend failed to initialize: {health.get('init_error')}")
+            return
+        await asyncio.sleep(0.5)
+    raise RuntimeError("Backend did not become ready in time")
+
+
+async def main(args):
+    queries = load_query_log(args.log) if args.log else synthetic_queries(args.synthetic, args.seed)
+    if not queries:
+        raise SystemExit("Query log is empty")
+    if args.shuffle:
+        random.Random(args.seed).shuffle(queries)
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    results = []
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url) as client:
+            await wait_until_ready(client, args.ready_timeout)
+            for level in levels:
+                results.append(await run_level(client, queries, level, args.requests, args.timeout))
+    else:
+        # Synthetic load must not end up in the query log that warm-up replays
+        os.environ["QUERY_LOG_SAMPLE_RATE"] = "0"
+        from backend.app import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                await wait_until_ready(client, args.ready_timeout)
+                for level in levels:
+                    results.append(await run_level(client, queries, level, args.requests, args.timeout))
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved to {args.json}")
+
+
+def print_report(results):
+    print()
+    print(f"{'conc':>5} {'reqs':>6} {'qps':>8} {'ok qps':>8} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'err %':>6} {'503 %':>6} {'429 %':>6}")
+    for r in results:
+        lat = r["latency_ms"]
+        print(f"{r['concurrency']:>5} {r['requests']:>6} {r['throughput_qps']:>8.1f} {r['ok_qps']:>8.1f} "
+              f"{lat['p50']:>8.1f} {lat['p90']:>8.1f} {lat['p99']:>8.1f} {lat['max']:>8.1f} "
+              f"{100 * r['error_rate']:>6.1f} {100 * r['rate_503']:>6.1f} {100 * r['rate_429']:>6.1f}")
+
+    for r in results:
+        print(f"\nLatency histogram @ concurrency {r['concurrency']} (statuses: {r['statuses']})")
+        peak = max(r["histogram_ms"].values()) or 1
+        for bucket, count in r["histogram_ms"].items():
+            print(f"  {bucket:>7} ms {count:>6} {'#' * round(40 * count / peak)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running backend (default: in-process ASGI)")
+    parser.add_argument("--log", help="JSONL query log to replay (default: synthetic queries)")
+    parser.add_argument("--synthetic", type=int, default=1000, help="Number of synthetic queries")
+    parser.add_argument("--shuffle", action="store_true", help="Shuffle the query log before replay")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (s)")
+    parser.add_argument("--ready-timeout", type=float, default=900.0, help="Max wait for /health readiness (s)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    asyncio.run(main(parser.parse_args()))
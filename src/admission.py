@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Overloaded(Exception):
+    """Raised when the search queue is full."""
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a search does not finish before its deadline."""
+
+
+class _Flight:
+    """
+    One in-progress computation, shared by every caller with the same key.
+    """
+    __slots__ = ("future", "deadline", "waiters", "submitted")
+
+    def __init__(self, deadline):
+        self.future = None
+        self.deadline = deadline
+        self.waiters = 1
+        self.submitted = time.monotonic()
+
+
+class SearchExecutor:
+    def __init__(self, max_workers=2, queue_limit=32, wait_window=1000):
+        """
+        Bounded executor for CPU-bound searches.
+        - max_workers: searches running at once
+        - queue_limit: searches allowed to wait for a worker; beyond that
+          new requests are rejected immediately (Overloaded)
+        - wait_window: number of recent queue-wait samples kept for metrics
+        Concurrent calls with the same key share one computation.
+        """
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._queued = 0
+        self._running = 0
+        self._waits_ms = deque(maxlen=wait_window)
+        self.counters = {
+            "submitted": 0,      # computations started (after coalescing)
+            "coalesced": 0,      # requests that joined an in-flight computation
+            "rejected": 0,       # queue full
+            "expired": 0,        # dequeued after the deadline, never run
+            "cancelled": 0,      # every waiter gave up before it started
+            "timed_out": 0,      # requests answered with DeadlineExceeded
+        }
+
+    async def run(self, key, fn, timeout):
+        """
+        Run fn() in the pool (or join an identical in-flight call) and
+        wait at most `timeout` seconds for the result.
+        """
+        deadline = time.monotonic() + timeout
+        flight = self._join(key, fn, deadline)
+        result = asyncio.wrap_future(flight.future)
+        # Consume the outcome even if this waiter has already timed out
+        result.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            # shield: one waiter timing out must not cancel the shared future
+            return await asyncio.wait_for(asyncio.shield(result), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.counters["timed_out"] += 1
+            raise DeadlineExceeded(f"Search did not finish within {timeout:.1f}s")
+        finally:
+            self._leave(key, flight)
+
+    def _join(self, key, fn, deadline):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                flight.deadline = max(flight.deadline, deadline)
+                self.counters["coalesced"] += 1
+                return flight
+
+            if self._queued + self._running >= self.max_workers + self.queue_limit:
+                self.counters["rejected"] += 1
+                raise Overloaded("Search queue is full")
+
+            flight = _Flight(deadline)
+            self._flights[key] = flight
+            self._queued += 1
+            self.counters["submitted"] += 1
+            flight.future = self._pool.submit(self._execute, key, flight, fn)
+            return flight
+
+    def _leave(self, key, flight):
+        with self._lock:
+            flight.waiters -= 1
+            # Nobody is waiting and it has not started: drop it from the queue
+            if flight.waiters == 0 and flight.future.cancel():
+                self._queued -= 1
+                self.counters["cancelled"] += 1
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def _execute(self, key, flight, fn):
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._waits_ms.append((started - flight.submitted) * 1000)
+            expired = started > flight.deadline
+            if expired:
+                self.counters["expired"] += 1
+        try:
+            if expired:
+                raise DeadlineExceeded("Search deadline passed while queued")
+            return fn()
+        finally:
+            with self._lock:
+                self._running -= 1
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def metrics(self):
+        with self._lock:
+            waits = sorted(self._waits_ms)
+            snapshot = {
+                "max_workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "queue_depth": self._queued,
+                "in_flight": self._running,
+                **self.counters,
+            }
+
+        def percentile(q):
+            return waits[min(len(waits) - 1, int(q * len(waits)))] if waits else 0.0
+
+        snapshot["queue_wait_ms"] = {
+            "p50": percentile(0.50),
+            "p99": percentile(0.99),
+            "max": waits[-1] if waits else 0.0,
+            "samples": len(waits),
+        }
+        return snapshot
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,141 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.memory import dict_nbytes
+
+# Default field weights – these reproduce the old token duplication in
+# build_search_text (title x2, ingredients x5, steps x1).
+DEFAULT_FIELD_WEIGHTS = {"title": 2.0, "ingredients": 5.0, "steps": 1.0}
+
+
+class BM25FIndex:
+    def __init__(self, fields, k1=1.5, b=0.75):
+        """
+        fields: dict of field name -> list of token lists (one per document)
+        Example: {"title": [["tomato", "soup"], ...],
+                  "ingredients": [["tomato", "onion"], ...], ...}
+        b: single value for every field, or dict of field name -> b
+        """
+        self.k1 = k1
+        self.field_names = list(fields)
+        self.N = len(next(iter(fields.values())))
+
+        if isinstance(b, dict):
+            self.b = {f: b.get(f, 0.75) for f in self.field_names}
+        else:
+            self.b = {f: b for f in self.field_names}
+
+        # Shared vocabulary across all fields
+        self.vocab = {}
+        for docs in fields.values():
+            for doc in docs:
+                for term in doc:
+                    if term not in self.vocab:
+                        self.vocab[term] = len(self.vocab)
+
+        # Term frequencies per field, stored column-wise (term -> postings)
+        self.term_freqs = {}
+        self.doc_lengths = {}
+        self.avg_doc_len = {}
+        for field, docs in fields.items():
+            if len(docs) != self.N:
+                raise ValueError(f"Field '{field}' has {len(docs)} documents, expected {self.N}")
+
+            # One term id per token in a compact int32 array (documents are
+            # contiguous, so this is already a CSR layout); summing duplicate
+            # entries turns token counts into term frequencies.
+            lengths = np.fromiter((len(doc) for doc in docs), dtype=np.int32, count=self.N)
+            indptr = np.zeros(self.N + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            cols = np.fromiter(
+                (self.vocab[term] for doc in docs for term in doc), dtype=np.int32, count=int(indptr[-1])
+            )
+
+            matrix = csr_matrix(
+                (np.ones(len(cols), dtype=np.float32), cols, indptr),
+                shape=(self.N, len(self.vocab)),
+            )
+            del cols
+            matrix.sum_duplicates()
+            self.term_freqs[field] = matrix.tocsc()
+            del matrix
+            self.doc_lengths[field] = lengths.astype(np.float32)
+            self.avg_doc_len[field] = float(self.doc_lengths[field].mean()) if self.N else 0.0
+
+        # Per-field length normalisation: 1 - b + b * (len / avg_len)
+        self._length_norms = {}
+        for field in self.field_names:
+            avg = self.avg_doc_len[field] or 1.0
+            b_f = self.b[field]
+            self._length_norms[field] = (1 - b_f + b_f * (self.doc_lengths[field] / avg)).astype(np.float32)
+
+        # Document frequency – a document counts once even if the term is in several fields
+        present = None
+        for matrix in self.term_freqs.values():
+            present = matrix.astype(bool) if present is None else present + matrix.astype(bool)
+        self.df = np.asarray(present.sum(axis=0)).ravel() if present is not None else np.zeros(0)
+
+        # IDF values (same formula as BM25Index)
+        self.idf = np.log(1 + (self.N - self.df + 0.5) / (self.df + 0.5))
+
+    def _resolve_weights(self, field_weights):
+        """
+        Merge query-time field weights over the defaults.
+        Fields not in the index and negative or non-finite weights are rejected.
+        """
+        weights = {f: DEFAULT_FIELD_WEIGHTS.get(f, 1.0) for f in self.field_names}
+        if field_weights:
+            unknown = set(field_weights) - set(self.field_names)
+            if unknown:
+                raise ValueError(f"Unknown fields: {sorted(unknown)}")
+            invalid = {f: w for f, w in field_weights.items() if not np.isfinite(w) or w < 0}
+            if invalid:
+                raise ValueError(f"Field weights must be finite and >= 0: {invalid}")
+            weights.update(field_weights)
+        return weights
+
+    def search(self, query_tokens, top_k=10, field_weights=None):
+        """
+        query_tokens: list of tokens
+        field_weights: optional dict of field name -> weight, e.g. {"title": 3.0}
+        """
+        weights = self._resolve_weights(field_weights)
+        scores = np.zeros(self.N, dtype=np.float64)
+
+        for term in query_tokens:
+            col = self.vocab.get(term)
+            if col is None:
+                continue
+
+            # Pseudo term frequency: weighted, length-normalised sum over fields
+            tf = np.zeros(self.N, dtype=np.float64)
+            for field, weight in weights.items():
+                if not weight:
+                    continue
+                matrix = self.term_freqs[field]
+                start, end = matrix.indptr[col], matrix.indptr[col + 1]
+                rows = matrix.indices[start:end]
+                tf[rows] += weight * matrix.data[start:end] / self._length_norms[field][rows]
+
+            scores += self.idf[col] * (tf * (self.k1 + 1)) / (tf + self.k1)
+
+        # Get top_k results
+        top_indices = scores.argsort()[::-1][:top_k]
+        return top_indices, scores[top_indices]
+
+    def compact(self):
+        """
+        Quantize term frequencies to uint8 (saturating at 255).
+        BM25 saturates long before that, so rankings are unaffected in practice.
+        """
+        for field, matrix in self.term_freqs.items():
+            matrix.data = np.minimum(matrix.data, 255).astype(np.uint8)
+
+    def memory_usage(self):
+        return {
+            "term_freqs": sum(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes for m in self.term_freqs.values()),
+            "doc_lengths": sum(a.nbytes for a in self.doc_lengths.values())
+                           + sum(a.nbytes for a in self._length_norms.values()),
+            "vocabulary": dict_nbytes(self.vocab),
+            "idf": self.idf.nbytes + self.df.nbytes,
+        }
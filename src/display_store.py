@@ -0,0 +1,70 @@
+import mmap
+import os
+
+import numpy as np
+
+
+class DiskColumnStore:
+    def __init__(self, df, columns, path):
+        """
+        Write text columns of df to `path` and keep only byte offsets in memory.
+        Values are read back through mmap, row by row, when results are displayed.
+        """
+        self.columns = list(columns)
+        self.path = path
+        self.offsets = {}
+
+        pos = 0
+        with open(path, "wb") as f:
+            for col in self.columns:
+                offsets = np.empty(len(df) + 1, dtype=np.int64)
+                offsets[0] = pos
+                for i, value in enumerate(df[col].tolist()):
+                    data = str(value).encode("utf-8")
+                    f.write(data)
+                    pos += len(data)
+                    offsets[i + 1] = pos
+                self.offsets[col] = offsets
+
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "rb")
+        size = os.path.getsize(self.path)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __getstate__(self):
+        # File handles are not picklable; reopen the same file on load
+        state = self.__dict__.copy()
+        del state["_file"], state["_mmap"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def get(self, col, positions):
+        """
+        Values of `col` for the given row positions.
+        """
+        offsets = self.offsets[col]
+        if self._mmap is None:
+            return ["" for _ in positions]
+        return [self._mmap[offsets[p]:offsets[p + 1]].decode("utf-8") for p in positions]
+
+    def attach(self, df, positions):
+        """
+        Return df with the stored columns filled in for the given row positions.
+        """
+        return df.assign(**{col: self.get(col, positions) for col in self.columns})
+
+    def memory_usage(self):
+        return {
+            "offsets": sum(o.nbytes for o in self.offsets.values()),
+            "on_disk": os.path.getsize(self.path),
+        }
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
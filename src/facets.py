@@ -0,0 +1,88 @@
+import numpy as np
+
+# Facet values offered next to results. Matching is the same substring
+# match on the tags string as src/filters.py, so a count equals the number
+# of results that filter value would return alongside the request's other
+# filters (HybridSearch counts each dimension without its own filter).
+DEFAULT_FACETS = {
+    "cuisine": [
+        "indian", "italian", "chinese", "mexican", "thai", "japanese",
+        "greek", "french", "american", "asian", "middle-eastern", "spanish",
+    ],
+    "diet": ["vegetarian", "vegan", "gluten-free", "low-carb", "low-fat", "dairy-free"],
+}
+
+# Cooking-time buckets (minutes); counts are cumulative ("under 30 min")
+TIME_BUCKETS = [15, 30, 60, 120]
+
+
+def _popcount64(words):
+    """
+    Set bits in each uint64 (SWAR popcount, numpy<2 has no bitwise_count).
+    """
+    words = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    words = (words & np.uint64(0x3333333333333333)) + ((words >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    words = (words + (words >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (words * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+def _pack(mask):
+    """
+    Pack a bool mask into uint64 words (zero-padded to a whole word).
+    """
+    padded = np.zeros(-(-len(mask) // 64) * 64, dtype=bool)
+    padded[:len(mask)] = mask
+    return np.packbits(padded).view(np.uint64)
+
+
+class FacetIndex:
+    def __init__(self, df, facets=None, time_buckets=None):
+        """
+        df: recipes dataframe with "tags" and "minutes" columns
+        facets: dict of facet name -> list of tag values (default DEFAULT_FACETS)
+        time_buckets: sorted minute limits (default TIME_BUCKETS)
+        """
+        facets = DEFAULT_FACETS if facets is None else facets
+        self.time_buckets = list(TIME_BUCKETS if time_buckets is None else time_buckets)
+        self.N = len(df)
+
+        # One packed bitmap row per (facet, value)
+        self.labels = []
+        rows = []
+        tags = df["tags"].fillna("").astype(str).str.lower()
+        for facet, values in facets.items():
+            for value in values:
+                mask = tags.str.contains(value.lower(), regex=False).to_numpy()
+                rows.append(_pack(mask))
+                self.labels.append((facet, value))
+        self.bitmaps = np.vstack(rows) if rows else np.zeros((0, -(-self.N // 64)), dtype=np.uint64)
+
+        # Minutes histogram index: bucket i holds recipes with
+        # time_buckets[i - 1] < minutes <= time_buckets[i]
+        self.minute_buckets = np.searchsorted(
+            self.time_buckets, df["minutes"].to_numpy(), side="left"
+        ).astype(np.uint8)
+
+    def counts(self, positions):
+        """
+        Facet counts for the documents at the given row positions.
+        """
+        mask = np.zeros(self.bitmaps.shape[1] * 64, dtype=bool)
+        mask[positions] = True
+        candidates = np.packbits(mask).view(np.uint64)
+
+        # Bitmap intersection + popcount for every facet value at once
+        totals = _popcount64(self.bitmaps & candidates).sum(axis=1)
+
+        result = {}
+        for (facet, value), total in zip(self.labels, totals):
+            result.setdefault(facet, {})[value] = int(total)
+
+        histogram = np.bincount(self.minute_buckets[positions], minlength=len(self.time_buckets) + 1)
+        cumulative = np.cumsum(histogram)[:len(self.time_buckets)]
+        result["max_time"] = {str(limit): int(c) for limit, c in zip(self.time_buckets, cumulative)}
+
+        return result
+
+    def memory_usage(self):
+        return {"bitmaps": self.bitmaps.nbytes, "minute_buckets": self.minute_buckets.nbytes}
@@ -0,0 +1,141 @@
+import ctypes
+import gc
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# -------------------------------------------------
+# PROCESS MEMORY
+# -------------------------------------------------
+
+def rss_bytes():
+    """
+    Current resident set size of this process (Linux only, else None).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes():
+    """
+    Peak resident set size of this process since the last reset_peak_rss()
+    (Linux), else since process start. None if unavailable.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss():
+    """
+    Reset the peak RSS high-water mark to the current RSS (Linux only).
+    Returns True if the reset worked; otherwise peak_rss_bytes() keeps
+    reporting the peak since process start.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def release_memory():
+    """
+    Collect garbage and ask glibc to return freed heap pages to the OS,
+    so dropping a large index actually lowers RSS.
+    """
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+# -------------------------------------------------
+# OBJECT SIZES
+# -------------------------------------------------
+
+def dict_nbytes(d):
+    """
+    Size of a dict including its keys and values (one level deep).
+    """
+    return sys.getsizeof(d) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in d.items())
+
+
+def memory_report(search_engine):
+    """
+    Bytes held by each component of a HybridSearch.
+    """
+    components = {
+        "tfidf": search_engine.tfidf.memory_usage(),
+        "dataframe": int(search_engine.df.memory_usage(deep=True).sum()),
+    }
+    if hasattr(search_engine.bm25, "memory_usage"):
+        components["bm25"] = search_engine.bm25.memory_usage()
+    if search_engine.positional is not None:
+        components["positional"] = search_engine.positional.memory_usage()
+    if search_engine.facets is not None:
+        components["facets"] = search_engine.facets.memory_usage()
+    if search_engine.display_store is not None:
+        components["display_store"] = search_engine.display_store.memory_usage()
+
+    total = 0
+    for name, value in components.items():
+        if isinstance(value, dict):
+            # Bytes on disk are not resident
+            total += sum(v for k, v in value.items() if k != "on_disk")
+        else:
+            total += value
+
+    return {"components": components, "total_bytes": total}
+
+
+# -------------------------------------------------
+# MEMORY BUDGET
+# -------------------------------------------------
+
+def fit_to_budget(search_engine, budget_bytes, store_path):
+    """
+    Apply compact representations, cheapest quality loss first, until
+    the indexed data fits within budget_bytes:
+    1. float32 TF-IDF weights
+    2. uint8 BM25F term frequencies
+    3. description / ingredients / steps moved to a disk-backed store
+    Returns the list of steps that were applied.
+    """
+    steps = [
+        ("tfidf_float32", search_engine.tfidf.compact),
+        ("bm25_uint8", getattr(search_engine.bm25, "compact", None)),
+        ("display_fields_on_disk", lambda: search_engine.offload_display_fields(
+            ["description", "ingredients", "steps"], store_path)),
+    ]
+
+    applied = []
+    for name, apply in steps:
+        if memory_report(search_engine)["total_bytes"] <= budget_bytes:
+            break
+        if apply is None:
+            continue
+        apply()
+        applied.append(name)
+
+    return applied
@@ -0,0 +1,206 @@
+import numpy as np
+
+from src.memory import dict_nbytes
+
+# Later fields are shifted by this many positions so that phrases and
+# proximity windows never span two fields (e.g. last ingredient + first step).
+FIELD_GAP = 64
+
+
+def write_varint(out, value):
+    """
+    Append one non-negative int to a bytearray as a LEB128 varint.
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_varint_deltas(positions, out=None):
+    """
+    Delta-encode a sorted list of positions as LEB128 varints.
+    Appends to `out` (a bytearray) if given.
+    """
+    if out is None:
+        out = bytearray()
+    prev = 0
+    for pos in positions:
+        write_varint(out, pos - prev)
+        prev = pos
+    return out
+
+
+def decode_varints(raw):
+    """
+    Vectorised decode of a uint8 array holding back-to-back LEB128 varints.
+    """
+    if len(raw) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # A byte without the high bit ends a value
+    is_end = raw < 0x80
+    starts = np.flatnonzero(np.concatenate(([True], is_end[:-1])))
+    lengths = np.diff(np.append(starts, len(raw)))
+    shift = 7 * (np.arange(len(raw)) - np.repeat(starts, lengths))
+    return np.add.reduceat((raw & 0x7F).astype(np.int64) << shift, starts)
+
+
+class PositionalIndex:
+    def __init__(self, fields):
+        """
+        fields: dict of field name -> list of token lists (one per document)
+        Example: {"ingredients": [["olive", "oil", "garlic"], ...],
+                  "steps": [["heat", "olive", "oil"], ...]}
+
+        Each term's postings are three varint streams stored back to back
+        in one shared blob:
+        - doc id gaps
+        - number of positions per doc
+        - position gaps (delta-encoded within each doc)
+        """
+        self.field_names = list(fields)
+        self.N = len(next(iter(fields.values())))
+
+        # term -> [doc gaps, counts, positions, last doc id]
+        building = {}
+        for doc_id in range(self.N):
+            doc_positions = {}
+            base = 0
+            for field in self.field_names:
+                doc = fields[field][doc_id]
+                for i, term in enumerate(doc):
+                    doc_positions.setdefault(term, []).append(base + i)
+                base += len(doc) + FIELD_GAP
+
+            for term, positions in doc_positions.items():
+                entry = building.get(term)
+                if entry is None:
+                    entry = building[term] = [bytearray(), bytearray(), bytearray(), 0]
+                write_varint(entry[0], doc_id - entry[3])
+                write_varint(entry[1], len(positions))
+                encode_varint_deltas(positions, entry[2])
+                entry[3] = doc_id
+
+        # Freeze into one blob + per-term stream boundaries
+        self.vocab = {}
+        bounds = []
+        parts = []
+        length = 0
+        for term, (doc_gaps, counts, positions, _) in building.items():
+            self.vocab[term] = len(bounds)
+            start = length
+            for part in (doc_gaps, counts, positions):
+                parts.append(bytes(part))
+                length += len(part)
+            bounds.append((start, start + len(doc_gaps), start + len(doc_gaps) + len(counts), length))
+        del building
+
+        self.bounds = np.array(bounds, dtype=np.int64).reshape(-1, 4)
+        self.blob = b"".join(parts)
+
+    def nbytes(self):
+        """
+        Size of the compressed postings (blob + stream boundaries).
+        """
+        return len(self.blob) + self.bounds.nbytes
+
+    def memory_usage(self):
+        return {"postings": self.nbytes(), "vocabulary": dict_nbytes(self.vocab)}
+
+    def _decode_term(self, term):
+        """
+        Decode all postings of a term.
+        Returns (doc ids, positions per doc, positions) as int64 arrays;
+        positions are absolute and grouped per doc in doc id order.
+        """
+        start, counts_at, positions_at, end = self.bounds[self.vocab[term]]
+        raw = np.frombuffer(self.blob, dtype=np.uint8)
+
+        docs = np.cumsum(decode_varints(raw[start:counts_at]))
+        counts = decode_varints(raw[counts_at:positions_at])
+
+        # Undo the per-doc delta encoding
+        running = np.cumsum(decode_varints(raw[positions_at:end]))
+        firsts = np.cumsum(counts) - counts
+        base = np.concatenate(([0], running))[firsts]
+        positions = running - np.repeat(base, counts)
+
+        return docs, counts, positions
+
+    def phrase_docs(self, phrase_tokens):
+        """
+        Sorted array of doc ids that contain phrase_tokens as consecutive tokens.
+        """
+        if not phrase_tokens:
+            return np.arange(self.N, dtype=np.int32)
+        if any(t not in self.vocab for t in phrase_tokens):
+            return np.empty(0, dtype=np.int32)
+
+        # Key every occurrence by (doc, phrase start) and intersect across terms
+        keys = None
+        for k, term in enumerate(phrase_tokens):
+            docs, counts, positions = self._decode_term(term)
+            docs = np.repeat(docs, counts)
+            valid = positions >= k
+            term_keys = (docs[valid] << 32) | (positions[valid] - k)
+            keys = term_keys if keys is None else np.intersect1d(keys, term_keys, assume_unique=True)
+            if len(keys) == 0:
+                break
+
+        return np.unique(keys >> 32).astype(np.int32)
+
+    def proximity_scores(self, query_tokens, doc_ids, window=5):
+        """
+        Proximity score for each doc in doc_ids.
+        Each pair of adjacent query terms found within `window` positions
+        of each other adds 1 / distance.
+        """
+        scores = np.zeros(len(doc_ids), dtype=np.float64)
+
+        terms = [t for t in dict.fromkeys(query_tokens) if t in self.vocab]
+        if len(terms) < 2 or len(doc_ids) == 0:
+            return scores
+
+        doc_ids = np.asarray(doc_ids)
+
+        # Position list of each term in each candidate doc (None if absent)
+        term_positions = {}
+        for term in terms:
+            docs, counts, positions = self._decode_term(term)
+            firsts = np.cumsum(counts) - counts
+            idx = np.minimum(np.searchsorted(docs, doc_ids), len(docs) - 1)
+            found = docs[idx] == doc_ids
+            term_positions[term] = [
+                positions[firsts[i]:firsts[i] + counts[i]].tolist() if ok else None
+                for i, ok in zip(idx, found)
+            ]
+
+        for a, b in zip(terms, terms[1:]):
+            for j, (left, right) in enumerate(zip(term_positions[a], term_positions[b])):
+                if left is None or right is None:
+                    continue
+                dist = _min_distance(left, right)
+                if dist <= window:
+                    scores[j] += 1.0 / max(dist, 1)
+
+        return scores
+
+
+def _min_distance(left, right):
+    """
+    Smallest |l - r| between two sorted position lists.
+    """
+    i = j = 0
+    best = float("inf")
+    while i < len(left) and j < len(right):
+        diff = left[i] - right[j]
+        if diff == 0:
+            return 0
+        if abs(diff) < best:
+            best = abs(diff)
+        if diff < 0:
+            i += 1
+        else:
+            j += 1
+    return best
@@ -120,24 +120,43 @@ def preprocess_steps(steps_str):
 
 
 # -------------------------------------------------
-# BUILD SEARCH TEXT
+# QUOTED PHRASES
 # -------------------------------------------------
 
-def build_search_text(title, ingredients_tokens, steps_tokens):
+def extract_phrases(query):
     """
-    Combine title, ingredients, and steps into one weighted search text.
+    Return the quoted phrases in a query string.
+    Example: 'pasta "olive oil"' -> ["olive oil"]
     """
-    cleaned_title = basic_clean(title)
-    title_tokens = tokenize(cleaned_title)
-    title_tokens = remove_stopwords(title_tokens)
-    title_tokens = lemmatize(title_tokens)
+    return [p for p in re.findall(r'"([^"]+)"', query) if p.strip()]
+
+
+# -------------------------------------------------
+# PREPROCESS TITLE
+# -------------------------------------------------
 
-    # Weights
-    weighted_title = title_tokens * 2
-    weighted_ing = ingredients_tokens * 5
-    weighted_steps = steps_tokens
+def preprocess_title(title):
+    """
+    Convert recipe title to cleaned tokens.
+    """
+    cleaned = basic_clean(str(title))
+    tokens = tokenize(cleaned)
+    tokens = remove_stopwords(tokens)
+    tokens = lemmatize(tokens)
 
-    all_tokens = weighted_title + weighted_ing + weighted_steps
+    return tokens
+
+
+# -------------------------------------------------
+# BUILD SEARCH TEXT
+# -------------------------------------------------
+
+def build_search_text(title_tokens, ingredients_tokens, steps_tokens):
+    """
+    Combine title, ingredients, and steps tokens into one search text.
+    Field weighting is left to BM25FIndex, so no tokens are repeated.
+    """
+    all_tokens = title_tokens + ingredients_tokens + steps_tokens
     return " ".join(all_tokens)
 
 
@@ -149,6 +168,7 @@ def preprocess_dataframe(df):
     """
     Apply preprocessing pipeline to recipes dataframe.
     Produces:
+    - title_tokens
     - ingredients_tokens
     - steps_tokens
     - search_text
@@ -159,14 +179,11 @@ def preprocess_dataframe(df):
 
     for _, row in df.iterrows():
 
+        title_tokens = preprocess_title(row["name"])
         ing_tokens = preprocess_ingredients(row["ingredients"])
         step_tokens = preprocess_steps(row["steps"])
 
-        search_text = build_search_text(
-            row["name"],
-            ing_tokens,
-            step_tokens
-        )
+        search_text = build_search_text(title_tokens, ing_tokens, step_tokens)
 
         processed_rows.append({
             "id": row["id"],
@@ -180,6 +197,7 @@ def preprocess_dataframe(df):
             "steps": row["steps"],
 
             # Processed fields (IR)
+            "title_tokens": title_tokens,
             "ingredients_tokens": ing_tokens,
             "steps_tokens": step_tokens,
             "search_text": search_text
@@ -0,0 +1,131 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter, deque
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class QueryLog:
+    def __init__(self, path, sample_rate=0.1, max_bytes=50 * 1024 * 1024):
+        """
+        Sampled, append-only JSONL log of search requests.
+        Writes happen on a background thread; when the file exceeds
+        max_bytes it is rotated once to `path + ".1"`. Several processes
+        may share the file: appends and rotation happen under a lock on
+        `path + ".lock"` (POSIX only).
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._lock = threading.Lock()
+
+    def record(self, body):
+        """
+        Log a request body (dict) with probability sample_rate.
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return
+        if self._writer is None:
+            self._start_writer()
+        self._queue.put({"ts": round(time.time(), 3), **body})
+
+    def _start_writer(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        lock = open(self.path + ".lock", "a") if fcntl is not None else None
+        f = open(self.path, "a", encoding="utf-8")
+        try:
+            while True:
+                record = self._queue.get()
+                # Drain everything already queued before writing once
+                lines = []
+                while record is not None:
+                    lines.append(json.dumps(record) + "\n")
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if lines:
+                    f = self._append(f, lock, "".join(lines))
+                if record is None:
+                    return
+        finally:
+            f.close()
+            if lock is not None:
+                lock.close()
+
+    def _append(self, f, lock, data):
+        """
+        Append data, rotating the file if it grew past max_bytes.
+        Returns the file object to keep writing to.
+        """
+        if lock is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            # Another process may have rotated the file since we opened it
+            try:
+                rotated = os.stat(self.path).st_ino != os.fstat(f.fileno()).st_ino
+            except FileNotFoundError:
+                rotated = True
+            if rotated:
+                f.close()
+                f = open(self.path, "a", encoding="utf-8")
+
+            f.write(data)
+            f.flush()
+
+            if f.tell() > self.max_bytes:
+                f.close()
+                os.replace(self.path, self.path + ".1")
+                f = open(self.path, "a", encoding="utf-8")
+            return f
+        finally:
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(timeout=2)
+
+
+def top_queries(path, n, key, max_lines=100_000):
+    """
+    The n most frequent records of a query log (and its rotated file),
+    grouped by key(record). Records for which key returns None are skipped.
+    Returns one example record per group, most frequent first.
+    """
+    lines = deque(maxlen=max_lines)
+    for p in (path + ".1", path):
+        if os.path.exists(p):
+            with open(p, encoding="utf-8") as f:
+                lines.extend(f)
+
+    counts = Counter()
+    examples = {}
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        k = key(record)
+        if k is None:
+            continue
+        counts[k] += 1
+        examples.setdefault(k, record)
+
+    return [examples[k] for k, _ in counts.most_common(n)]
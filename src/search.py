@@ -1,12 +1,24 @@
 import numpy as np
+from src.display_store import DiskColumnStore
 from src.filters import filter_by_diet, filter_by_cuisine, filter_by_time
 
 
 class HybridSearch:
-    def __init__(self, tfidf_index, bm25_index, df):
+    def __init__(self, tfidf_index, bm25_index, df, positional_index=None, facet_index=None):
         self.tfidf = tfidf_index
         self.bm25 = bm25_index
         self.df = df
+        self.positional = positional_index
+        self.facets = facet_index
+        self.display_store = None
+
+    def offload_display_fields(self, columns, path):
+        """
+        Move display-only columns to a disk-backed store; they are read
+        back only for the rows a search returns.
+        """
+        self.display_store = DiskColumnStore(self.df, columns, path)
+        self.df = self.df.drop(columns=columns)
 
     def search(
         self,
@@ -16,20 +28,38 @@ class HybridSearch:
         alpha=0.7,
         diet=None,
         cuisine=None,
-        max_time=None
+        max_time=None,
+        field_weights=None,
+        phrases=None,
+        proximity_weight=0.1,
+        proximity_candidates=200,
+        facets=False
     ):
         """
         Hybrid search with optional filters:
         - diet: list (e.g. ["vegetarian"])
         - cuisine: string (e.g. "indian")
         - max_time: integer (minutes)
+        - field_weights: dict (e.g. {"title": 3.0}), only for BM25F indices
+        - phrases: list of token lists that must appear verbatim (e.g. [["sour", "cream"]])
+        - proximity_weight: boost for query terms appearing close together,
+          applied to the top proximity_candidates documents
+        - facets: if True, counts per cuisine/diet/time bucket over all matching
+          documents are returned in results.attrs["facets"]; each dimension
+          is counted with the other filters applied but not its own
+        Phrases and proximity need a positional index; facets need a facet index.
         """
+        if phrases and self.positional is None:
+            raise ValueError("Phrase queries require a positional index")
+        if facets and self.facets is None:
+            raise ValueError("Facet counts require a facet index")
 
         # 1. TF-IDF full ranking
         tfidf_indices, tfidf_scores = self.tfidf.search(query, top_k=len(self.df))
 
         # 2. BM25 full ranking
-        bm25_indices, bm25_scores = self.bm25.search(query_tokens, top_k=len(self.df))
+        bm25_kwargs = {"field_weights": field_weights} if field_weights else {}
+        bm25_indices, bm25_scores = self.bm25.search(query_tokens, top_k=len(self.df), **bm25_kwargs)
 
         # Convert to maps (document_index -> score)
         tfidf_map = dict(zip(tfidf_indices, tfidf_scores))
@@ -58,8 +88,21 @@ class HybridSearch:
         # Hybrid score
         final_scores = alpha * bm25_norm + (1 - alpha) * tfidf_norm
 
+        # Proximity boost: rerank the best candidates by query-term closeness
+        if self.positional is not None and proximity_weight and len(set(query_tokens)) > 1:
+            candidates = np.argsort(final_scores)[::-1][:proximity_candidates]
+            boosts = self.positional.proximity_scores(query_tokens, candidates)
+            if boosts.max() > 0:
+                final_scores[candidates] += proximity_weight * boosts / boosts.max()
+
         # Sort documents by hybrid score (get indices into all_doc_indices)
         sorted_score_indices = np.argsort(final_scores)[::-1]
+
+        # Phrase filter: keep only documents containing every quoted phrase
+        for phrase in phrases or []:
+            if phrase:
+                allowed = self.positional.phrase_docs(phrase)
+                sorted_score_indices = sorted_score_indices[np.isin(sorted_score_indices, allowed)]
         
         # Get the actual document indices in sorted order
         sorted_doc_indices = [all_doc_indices[i] for i in sorted_score_indices]
@@ -68,15 +111,43 @@ class HybridSearch:
         ranked_df = self.df.iloc[sorted_doc_indices].copy()
         ranked_df["final_score"] = final_scores[sorted_score_indices]
 
-        # Apply filters
+        # Apply filters (as row masks, so facets can leave one out)
+        everything = np.ones(len(ranked_df), dtype=bool)
+        masks = {"diet": everything, "cuisine": everything, "max_time": everything}
         if diet:
-            ranked_df = filter_by_diet(ranked_df, diet)
+            masks["diet"] = ranked_df.index.isin(filter_by_diet(ranked_df, diet).index)
 
         # Always call filter_by_cuisine - it handles None and empty strings internally
-        ranked_df = filter_by_cuisine(ranked_df, cuisine)
+        by_cuisine = filter_by_cuisine(ranked_df, cuisine)
+        if len(by_cuisine) != len(ranked_df):
+            masks["cuisine"] = ranked_df.index.isin(by_cuisine.index)
 
         if max_time:
-            ranked_df = filter_by_time(ranked_df, max_time)
+            masks["max_time"] = ranked_df.index.isin(filter_by_time(ranked_df, max_time).index)
+
+        kept = masks["diet"] & masks["cuisine"] & masks["max_time"]
+        ranked_df = ranked_df[kept]
+
+        # Facet counts over every document the filters see, not just the top_k.
+        # Each dimension is counted without its own filter, so choosing a
+        # cuisine still shows how many results every other cuisine has.
+        facet_counts = None
+        if facets:
+            positions = np.asarray(sorted_doc_indices, dtype=np.int64)
+            facet_counts = self.facets.counts(positions[kept])
+            for name, mask in masks.items():
+                if mask is everything or name not in facet_counts:
+                    continue
+                others = everything.copy()
+                for other, other_mask in masks.items():
+                    if other != name:
+                        others &= other_mask
+                facet_counts[name] = self.facets.counts(positions[others])[name]
 
         # Return top results
-        return ranked_df.head(top_k)
+        results = ranked_df.head(top_k)
+        if self.display_store is not None:
+            results = self.display_store.attach(results, self.df.index.get_indexer(results.index))
+        if facet_counts is not None:
+            results.attrs["facets"] = facet_counts
+        return results
@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.metrics.pairwise import linear_kernel
+
+from src.memory import dict_nbytes
 
 class TFIDFIndex:
     def __init__(self, documents):
@@ -14,9 +17,25 @@ class TFIDFIndex:
         """
         Search for top_k similar recipes based on TF-IDF cosine similarity.
         """
-        query_vec = self.vectorizer.transform([query_text])
-        scores = cosine_similarity(query_vec, self.doc_matrix).flatten()
+        query_vec = self.vectorizer.transform([query_text]).astype(self.doc_matrix.dtype)
+        # Rows are already L2-normalised, so the dot product is the cosine
+        # (cosine_similarity would re-normalise a copy of the whole matrix).
+        scores = linear_kernel(query_vec, self.doc_matrix).flatten()
 
         # Sort scores (highest first)
         top_indices = scores.argsort()[::-1][:top_k]
         return top_indices, scores[top_indices]
+
+    def compact(self):
+        """
+        Store TF-IDF weights as float32 (halves the matrix data).
+        """
+        self.doc_matrix = self.doc_matrix.astype(np.float32)
+
+    def memory_usage(self):
+        m = self.doc_matrix
+        return {
+            "matrix": m.data.nbytes + m.indices.nbytes + m.indptr.nbytes,
+            "vocabulary": dict_nbytes(self.vectorizer.vocabulary_),
+            "idf": self.vectorizer.idf_.nbytes,
+        }